@@ -5,13 +5,23 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
+import altair as alt
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import time
 from datetime import datetime
 import hashlib
+import hmac
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from streamlit_lottie import st_lottie
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
+import logging
+import queue
+import threading
 from contextlib import contextmanager
 
 # ======================
@@ -24,12 +34,72 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+logger = logging.getLogger(__name__)
+
 # ======================
 # DATABASE CONFIGURATION
 # ======================
 # SQLite Database Configuration
 DB_PATH = "hostel_feedback.db"
 
+# Bump whenever create_tables_sql changes so existing databases rerun it
+SCHEMA_VERSION = 3
+
+# Write-ahead logging lets dashboard reads run alongside feedback writes, and
+# synchronous=NORMAL only fsyncs at checkpoints instead of on every commit
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+# Feedback categories, each backed by a <category>_feedback/<category>_rating column pair
+FEEDBACK_CATEGORIES = ('hostel', 'mess', 'bathroom')
+
+# Rows fetched per "Load more" click on the paginated admin tables
+PAGE_SIZE = 50
+
+# Choices offered on the feedback form
+RATINGS = ('A', 'B', 'C', 'D', 'E')
+MESS_TYPES = ('Veg', 'Non-Veg', 'Special', 'Food-Park')
+
+# Rows converted to Arrow at a time when building CSV exports
+CSV_EXPORT_CHUNK_ROWS = 10000
+
+# Categorical dtypes for the fixed-choice feedback columns
+RATING_DTYPE = pd.CategoricalDtype(RATINGS, ordered=True)
+MESS_TYPE_DTYPE = pd.CategoricalDtype(MESS_TYPES)
+FEEDBACK_DTYPES = {
+    'hostel_rating': RATING_DTYPE,
+    'mess_rating': RATING_DTYPE,
+    'bathroom_rating': RATING_DTYPE,
+    'mess_type': MESS_TYPE_DTYPE,
+}
+
+# Filter choices shared by the admin feedback viewers
+RATING_OPTIONS = ('All',) + RATINGS
+MESS_TYPE_OPTIONS = ('All',) + MESS_TYPES
+
+# Background feedback writer: rows per transaction, and how long to wait for
+# a batch to fill before flushing what has arrived
+FEEDBACK_BATCH_SIZE = 50
+FEEDBACK_FLUSH_SECONDS = 0.25
+
+# Chart colour per rating, from A (excellent) to E (poor)
+RATING_COLORS = {'A': '#22c55e', 'B': '#3b82f6', 'C': '#eab308', 'D': '#ef4444', 'E': '#ef4444'}
+
+# (question, markdown answer) pairs shown on the FAQ page
+FAQ_ENTRIES = (
+    ("How do I submit feedback?",
+     "After logging in, go to 'Submit Feedback' and fill out the form."),
+    ("What do the ratings mean?",
+     "- A: Excellent\n- B: Good\n- C: Average\n- D: Below average\n- E: Poor"),
+    ("Who can view my feedback?",
+     "Only authorized administrators can view feedback with strict confidentiality."),
+)
+
 # ======================
 # SECURITY SETTINGS
 # ======================
@@ -40,23 +110,55 @@ ADMIN_PASSWORD_HASH = hashlib.sha256("Soumya@1234".encode()).hexdigest()
 # ======================
 # DATABASE CONNECTION MANAGEMENT
 # ======================
+@st.cache_resource
+def get_conn():
+    """Open the shared SQLite connection once per server process"""
+    # sqlite3 keeps prepared statements in a per-connection LRU keyed by SQL text;
+    # size it above the number of distinct queries so none is ever re-prepared
+    connection = sqlite3.connect(
+        DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=256
+    )
+    connection.row_factory = sqlite3.Row  # Enable column access by name
+    # PRAGMAs must run outside a transaction, so issue them one at a time
+    cursor = connection.cursor()
+    for pragma in DB_PRAGMAS:
+        cursor.execute(pragma)
+    return connection
+
+@st.cache_resource
+def get_db_lock():
+    """Lock serializing use of the shared connection across sessions"""
+    return threading.RLock()
+
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections"""
-    connection = None
-    try:
-        connection = sqlite3.connect(DB_PATH)
-        connection.row_factory = sqlite3.Row  # Enable column access by name
+    """Context manager lending out the shared database connection"""
+    with get_db_lock():
+        try:
+            connection = get_conn()
+        except sqlite3.Error as e:
+            st.error(f"Database connection error: {e}")
+            connection = None
         yield connection
-    except sqlite3.Error as e:
-        st.error(f"Database connection error: {e}")
-        yield None
-    finally:
-        if connection:
-            connection.close()
 
+@contextmanager
+def db_transaction():
+    """Context manager running the enclosed writes as one BEGIN IMMEDIATE ... COMMIT"""
+    with get_db_connection() as connection:
+        if connection is None:
+            yield None
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+
+@st.cache_resource(show_spinner=False)
 def initialize_database():
-    """Create database tables according to E-R diagram"""
+    """Create database tables according to E-R diagram, once per server process"""
     create_tables_sql = """
     -- Users Table (matches E-R diagram exactly)
     CREATE TABLE IF NOT EXISTS users (
@@ -133,6 +235,44 @@ def initialize_database():
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
 
+    -- Indexes for the feedback ordering/grouping and log queries
+    CREATE INDEX IF NOT EXISTS idx_feedback_ts ON feedback(timestamp DESC);
+    CREATE INDEX IF NOT EXISTS idx_feedback_user ON feedback(username);
+    CREATE INDEX IF NOT EXISTS idx_feedback_hr ON feedback(hostel_rating);
+    CREATE INDEX IF NOT EXISTS idx_feedback_mr ON feedback(mess_rating);
+    CREATE INDEX IF NOT EXISTS idx_feedback_br ON feedback(bathroom_rating);
+    CREATE INDEX IF NOT EXISTS idx_admin_logs_ts ON admin_logs(timestamp DESC);
+
+    -- Indexes on the guest/stay/room/hostel join keys used by get_all_guests
+    CREATE INDEX IF NOT EXISTS idx_guest_user ON guest(user_id);
+    CREATE INDEX IF NOT EXISTS idx_guest_name ON guest(name);
+    CREATE INDEX IF NOT EXISTS idx_stays_guest ON stays_in_room(guest_id);
+    CREATE INDEX IF NOT EXISTS idx_stays_room ON stays_in_room(room_id);
+    CREATE INDEX IF NOT EXISTS idx_room_hostel ON room(hostel_id);
+
+    -- Running per-action totals for admin_logs, maintained by log_admin_action
+    CREATE TABLE IF NOT EXISTS log_action_counts (
+        action TEXT PRIMARY KEY,
+        cnt INTEGER NOT NULL DEFAULT 0
+    );
+
+    -- Backfill totals for actions logged before the summary table existed
+    INSERT OR IGNORE INTO log_action_counts (action, cnt)
+    SELECT action, COUNT(*) FROM admin_logs GROUP BY action;
+
+    -- Keep the per-action totals in step when log rows are removed
+    CREATE TRIGGER IF NOT EXISTS admin_logs_count_delete AFTER DELETE ON admin_logs
+    BEGIN
+        UPDATE log_action_counts SET cnt = cnt - 1 WHERE action = OLD.action;
+    END;
+
+    -- Retain only the latest 10000 admin log rows. Ids are only ever removed
+    -- from the old end, so they stay contiguous and a range delete suffices.
+    CREATE TRIGGER IF NOT EXISTS admin_logs_cap AFTER INSERT ON admin_logs
+    BEGIN
+        DELETE FROM admin_logs WHERE id <= NEW.id - 10000;
+    END;
+
     -- Insert default hostel data if not exists
     INSERT OR IGNORE INTO hostel (hostel_id, name, location) VALUES 
     (1, 'Main Hostel', 'Campus North'),
@@ -153,8 +293,12 @@ def initialize_database():
         with get_db_connection() as connection:
             if connection:
                 cursor = connection.cursor()
-                cursor.executescript(create_tables_sql)
-                connection.commit()
+                # Only run the DDL when the file predates the current schema version
+                cursor.execute("PRAGMA user_version")
+                if cursor.fetchone()[0] < SCHEMA_VERSION:
+                    cursor.executescript(
+                        create_tables_sql + f"\nPRAGMA user_version={SCHEMA_VERSION};"
+                    )
                 return True
     except sqlite3.Error as e:
         st.error(f"Database initialization error: {e}")
@@ -165,140 +309,198 @@ def initialize_database():
 # HELPER FUNCTIONS
 # ======================
 def hash_password(password):
-    """Securely hash passwords using SHA-256"""
+    """Securely hash passwords using SHA-256 (OpenSSL-backed one-shot digest)"""
     return hashlib.sha256(password.encode()).hexdigest()
 
+@st.cache_data(max_entries=16, show_spinner=False)
+def dataframe_to_csv(df):
+    """Serialize a DataFrame to CSV bytes with Arrow's C++ writer, memoized per frame"""
+    # Convert slice by slice so only one chunk is held as Arrow data at a time
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa_csv.CSVWriter(sink, schema) as writer:
+        for start in range(0, len(df), CSV_EXPORT_CHUNK_ROWS):
+            chunk = df.iloc[start:start + CSV_EXPORT_CHUNK_ROWS]
+            writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+    return sink.getvalue().to_pybytes()
+
+def with_feedback_dtypes(df):
+    """Store the rating and mess type columns of a feedback frame as categoricals"""
+    return df.astype({column: dtype for column, dtype in FEEDBACK_DTYPES.items() if column in df.columns})
+
+def like_pattern(term):
+    """Build a LIKE ... ESCAPE '\\' pattern matching term anywhere in a column"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+@st.cache_resource
+def get_password_hasher():
+    """Argon2id hasher for student passwords, configured once per server process"""
+    return PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+
+def hash_user_password(password):
+    """Hash a student password with Argon2id"""
+    return get_password_hasher().hash(password)
+
+def verify_user_password(stored_hash, password):
+    """Check a password against a stored Argon2id or legacy SHA-256 hash"""
+    if not stored_hash.startswith('$argon2'):
+        return hmac.compare_digest(stored_hash, hash_password(password))
+    try:
+        return get_password_hasher().verify(stored_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def password_needs_rehash(stored_hash):
+    """Whether a stored hash is legacy SHA-256 or uses outdated Argon2 parameters"""
+    return (not stored_hash.startswith('$argon2')
+            or get_password_hasher().check_needs_rehash(stored_hash))
+
+@st.cache_resource
+def get_http_session():
+    """Shared HTTP session so asset downloads reuse pooled keep-alive connections"""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
+@st.cache_data(ttl=86400, show_spinner=False, max_entries=16)
+def fetch_lottie_json(url):
+    """Download a Lottie animation, memoized for a day across reruns and sessions"""
+    r = get_http_session().get(url, timeout=5)
+    r.raise_for_status()
+    return r.json()
+
 def load_lottieurl(url):
     """Load Lottie animations from URL"""
+    # Failures raise inside the cached fetch, so they are retried rather than memoized
     try:
-        r = requests.get(url, timeout=5)
-        return None if r.status_code != 200 else r.json()
-    except:
+        return fetch_lottie_json(url)
+    except (requests.RequestException, ValueError):
         return None
 
 def init_session_state():
     """Initialize session state variables"""
-    if 'logged_in' not in st.session_state:
-        st.session_state.logged_in = False
+    if 'role' not in st.session_state:
+        st.session_state.role = 'guest'  # 'guest', 'user' or 'admin'
     if 'current_user' not in st.session_state:
         st.session_state.current_user = None
-    if 'is_admin' not in st.session_state:
-        st.session_state.is_admin = False
-    if 'db_initialized' not in st.session_state:
-        st.session_state.db_initialized = False
 
 def log_admin_action(action, details=""):
     """Record admin activities"""
     try:
-        with get_db_connection() as connection:
+        # The log row and its running total share one commit
+        with db_transaction() as connection:
             if connection:
                 cursor = connection.cursor()
-                timestamp = datetime.now().isoformat()
-                cursor.execute(
-                    "INSERT INTO admin_logs (timestamp, action, details) VALUES (?, ?, ?)",
-                    (timestamp, action, details)
-                )
-                connection.commit()
+                cursor.execute("""
+                    INSERT INTO admin_logs (timestamp, action, details)
+                    VALUES (strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'), ?, ?)
+                """, (action, details))
+                cursor.execute("""
+                    INSERT INTO log_action_counts (action, cnt) VALUES (?, 1)
+                    ON CONFLICT(action) DO UPDATE SET cnt = cnt + 1
+                """, (action,))
     except sqlite3.Error as e:
         st.error(f"Error logging admin action: {e}")
 
 # ======================
 # DATABASE OPERATIONS (Updated for new schema)
 # ======================
-def get_user_count():
-    """Get total number of registered users"""
+@st.cache_data(ttl=60)
+def get_dashboard_stats():
+    """Get the user, guest, hostel, room and feedback totals in one query"""
     try:
         with get_db_connection() as connection:
             if connection:
                 cursor = connection.cursor()
-                cursor.execute("SELECT COUNT(*) FROM users")
-                count = cursor.fetchone()[0]
-                return count
-    except sqlite3.Error as e:
-        st.error(f"Error getting user count: {e}")
-    return 0
-
-def get_guest_count():
-    """Get total number of guests"""
-    try:
-        with get_db_connection() as connection:
-            if connection:
-                cursor = connection.cursor()
-                cursor.execute("SELECT COUNT(*) FROM guest")
-                count = cursor.fetchone()[0]
-                return count
-    except sqlite3.Error as e:
-        st.error(f"Error getting guest count: {e}")
-    return 0
-
-def get_hostel_count():
-    """Get total number of hostels"""
-    try:
-        with get_db_connection() as connection:
-            if connection:
-                cursor = connection.cursor()
-                cursor.execute("SELECT COUNT(*) FROM hostel")
-                count = cursor.fetchone()[0]
-                return count
-    except sqlite3.Error as e:
-        st.error(f"Error getting hostel count: {e}")
-    return 0
-
-def get_room_count():
-    """Get total number of rooms"""
-    try:
-        with get_db_connection() as connection:
-            if connection:
-                cursor = connection.cursor()
-                cursor.execute("SELECT COUNT(*) FROM room")
-                count = cursor.fetchone()[0]
-                return count
+                cursor.execute("""
+                SELECT (SELECT COUNT(*) FROM users) AS users,
+                       (SELECT COUNT(*) FROM guest) AS guests,
+                       (SELECT COUNT(*) FROM hostel) AS hostels,
+                       (SELECT COUNT(*) FROM room) AS rooms,
+                       (SELECT COUNT(*) FROM feedback) AS feedback,
+                       (SELECT COUNT(last_login) FROM users) AS users_with_login,
+                       (SELECT COUNT(*) FROM users
+                        WHERE date(created_at) >= date('now', '-7 days')) AS new_users
+                """)
+                return dict(cursor.fetchone())
     except sqlite3.Error as e:
-        st.error(f"Error getting room count: {e}")
-    return 0
+        st.error(f"Error getting dashboard statistics: {e}")
+    return {'users': 0, 'guests': 0, 'hostels': 0, 'rooms': 0, 'feedback': 0,
+            'users_with_login': 0, 'new_users': 0}
 
+@st.cache_data(ttl=60)
 def get_all_hostels():
     """Get all hostels"""
     try:
         with get_db_connection() as connection:
             if connection:
-                cursor = connection.cursor()
-                cursor.execute("SELECT * FROM hostel")
-                results = cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
-    except sqlite3.Error as e:
+                return pd.read_sql_query("SELECT * FROM hostel", connection)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
         st.error(f"Error getting hostels: {e}")
     return pd.DataFrame()
 
+@st.cache_data(ttl=60)
 def get_all_rooms():
     """Get all rooms with hostel information"""
     try:
         with get_db_connection() as connection:
             if connection:
-                cursor = connection.cursor()
                 query = """
-                SELECT r.room_id, r.room_number, r.type, h.name as hostel_name, h.location
+                SELECT r.room_id, r.room_number, r.type, h.name as hostel_name, h.location,
+                       r.room_number || ' (' || h.name || ')' AS label
                 FROM room r
                 JOIN hostel h ON r.hostel_id = h.hostel_id
                 ORDER BY h.name, r.room_number
                 """
-                cursor.execute(query)
-                results = cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
-    except sqlite3.Error as e:
+                return pd.read_sql_query(query, connection)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
         st.error(f"Error getting rooms: {e}")
     return pd.DataFrame()
 
+@st.cache_data(ttl=60)
+def get_guests_without_room():
+    """Get guests who have never been assigned a room"""
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                query = """
+                SELECT g.guest_id, g.name
+                FROM guest g
+                WHERE NOT EXISTS (SELECT 1 FROM stays_in_room s WHERE s.guest_id = g.guest_id)
+                ORDER BY g.name
+                """
+                return pd.read_sql_query(query, connection)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        st.error(f"Error getting unassigned guests: {e}")
+    return pd.DataFrame()
+
+@st.cache_data(ttl=60)
+def get_current_stays():
+    """Get guests currently checked in to a room"""
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                query = """
+                SELECT g.guest_id, g.name, s.room_id, r.room_number,
+                       g.name || ' (Room ' || r.room_number || ')' AS label
+                FROM stays_in_room s
+                JOIN guest g ON s.guest_id = g.guest_id
+                JOIN room r ON s.room_id = r.room_id
+                WHERE s.check_out_date IS NULL
+                ORDER BY g.name
+                """
+                return pd.read_sql_query(query, connection)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        st.error(f"Error getting current stays: {e}")
+    return pd.DataFrame()
+
+@st.cache_data(ttl=60)
 def get_all_guests():
     """Get all guests with their stay information"""
     try:
         with get_db_connection() as connection:
             if connection:
-                cursor = connection.cursor()
                 query = """
                 SELECT g.guest_id, g.name, g.email, u.username, u.reg_no,
                        r.room_number, h.name as hostel_name,
@@ -310,34 +512,42 @@ def get_all_guests():
                 LEFT JOIN hostel h ON r.hostel_id = h.hostel_id
                 ORDER BY g.name
                 """
-                cursor.execute(query)
-                results = cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
-    except sqlite3.Error as e:
+                return pd.read_sql_query(query, connection)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
         st.error(f"Error getting guests: {e}")
     return pd.DataFrame()
 
-def get_feedback_count():
-    """Get total number of feedback entries"""
+def get_feedback_epoch():
+    """Get the highest feedback id, which changes whenever feedback is added"""
     try:
         with get_db_connection() as connection:
             if connection:
                 cursor = connection.cursor()
-                cursor.execute("SELECT COUNT(*) FROM feedback")
-                count = cursor.fetchone()[0]
-                return count
+                cursor.execute("SELECT MAX(id) FROM feedback")
+                return cursor.fetchone()[0] or 0
     except sqlite3.Error as e:
-        st.error(f"Error getting feedback count: {e}")
+        st.error(f"Error getting feedback epoch: {e}")
     return 0
 
+@st.cache_data(ttl=60)
+def get_username_options(epoch):
+    """Get the user filter choices, memoized per feedback epoch"""
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                cursor = connection.cursor()
+                cursor.execute("SELECT DISTINCT username FROM feedback ORDER BY username")
+                return ('All',) + tuple(row[0] for row in cursor.fetchall())
+    except sqlite3.Error as e:
+        st.error(f"Error getting feedback usernames: {e}")
+    return ('All',)
+
+@st.cache_data(ttl=60)
 def get_recent_feedback(limit=5):
     """Get recent feedback entries"""
     try:
         with get_db_connection() as connection:
             if connection:
-                cursor = connection.cursor()
                 query = """
                 SELECT username, timestamp, hostel_rating, mess_type, mess_rating, 
                        bathroom_rating, other_comments 
@@ -345,160 +555,360 @@ def get_recent_feedback(limit=5):
                 ORDER BY timestamp DESC 
                 LIMIT ?
                 """
-                cursor.execute(query, (limit,))
-                results = cursor.fetchall()
-                
-                # Convert to list of dictionaries
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
-    except sqlite3.Error as e:
+                return pd.read_sql_query(query, connection, params=(limit,))
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
         st.error(f"Error getting recent feedback: {e}")
     return pd.DataFrame()
 
-def get_all_feedback():
-    """Get all feedback entries"""
+def feedback_filter_conditions(since=None, username=None, mess_type=None, rating=None):
+    """Build the WHERE conditions and parameters for the complete feedback filters
+
+    rating matches any of the hostel, mess or bathroom ratings.
+    """
+    conditions, params = [], []
+    if since:
+        conditions.append("timestamp >= ?")
+        params.append(since.isoformat())
+    if username:
+        conditions.append("username = ?")
+        params.append(username)
+    if mess_type:
+        conditions.append("mess_type = ?")
+        params.append(mess_type)
+    if rating:
+        conditions.append("(hostel_rating = ? OR mess_rating = ? OR bathroom_rating = ?)")
+        params.extend([rating] * 3)
+    return conditions, params
+
+@st.cache_data(ttl=60)
+def get_all_feedback_summary(before_id=None, limit=PAGE_SIZE, since=None, username=None,
+                             mess_type=None, rating=None):
+    """Get one page of filtered feedback entries without the long comment columns, newest first"""
     try:
         with get_db_connection() as connection:
             if connection:
-                cursor = connection.cursor()
-                cursor.execute("SELECT * FROM feedback ORDER BY timestamp DESC")
-                results = cursor.fetchall()
-                
-                # Convert to list of dictionaries
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
-    except sqlite3.Error as e:
+                conditions, params = feedback_filter_conditions(since, username, mess_type, rating)
+                query = f"""
+                SELECT id, username, timestamp, hostel_rating, mess_type, mess_rating, bathroom_rating
+                FROM feedback 
+                WHERE {' AND '.join(['(? IS NULL OR id < ?)'] + conditions)}
+                ORDER BY id DESC
+                LIMIT ?
+                """
+                # Parse timestamps once here so filters and displays reuse the datetime column
+                return with_feedback_dtypes(pd.read_sql_query(
+                    query, connection, params=[before_id, before_id] + params + [limit],
+                    parse_dates={'timestamp': {'format': 'ISO8601'}}
+                ))
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
         st.error(f"Error getting all feedback: {e}")
     return pd.DataFrame()
 
-def get_hostel_feedback():
-    """Get hostel-specific feedback entries"""
+@st.cache_data(ttl=60)
+def count_feedback(since=None, username=None, mess_type=None, rating=None):
+    """Count every feedback entry matching the filters"""
     try:
         with get_db_connection() as connection:
             if connection:
-                cursor = connection.cursor()
-                query = """
-                SELECT username, timestamp, hostel_feedback, hostel_rating, other_comments
-                FROM feedback 
-                WHERE hostel_feedback IS NOT NULL AND hostel_feedback != ''
-                ORDER BY timestamp DESC
-                """
-                cursor.execute(query)
-                results = cursor.fetchall()
-                
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
+                conditions, params = feedback_filter_conditions(since, username, mess_type, rating)
+                query = "SELECT COUNT(*) FROM feedback"
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                return connection.execute(query, params).fetchone()[0]
     except sqlite3.Error as e:
-        st.error(f"Error getting hostel feedback: {e}")
+        st.error(f"Error counting feedback: {e}")
+    return 0
+
+@st.cache_data(ttl=60)
+def get_feedback_export(since=None, username=None, mess_type=None, rating=None):
+    """Get every complete feedback entry matching the filters, comments included, for CSV export"""
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                conditions, params = feedback_filter_conditions(since, username, mess_type, rating)
+                query = "SELECT * FROM feedback"
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                query += " ORDER BY id DESC"
+                return pd.read_sql_query(query, connection, params=params)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        st.error(f"Error exporting feedback: {e}")
     return pd.DataFrame()
 
-def get_mess_feedback():
-    """Get mess-specific feedback entries"""
+def get_feedback_detail(feedback_id):
+    """Get the comment fields of a single feedback entry"""
     try:
         with get_db_connection() as connection:
             if connection:
                 cursor = connection.cursor()
-                query = """
-                SELECT username, timestamp, mess_feedback, mess_type, mess_rating, other_comments
+                cursor.execute("""
+                    SELECT id, username, timestamp, hostel_feedback, mess_feedback,
+                           bathroom_feedback, other_comments
+                    FROM feedback 
+                    WHERE id = ?
+                """, (feedback_id,))
+                row = cursor.fetchone()
+                return dict(row) if row else None
+    except sqlite3.Error as e:
+        st.error(f"Error getting feedback details: {e}")
+    return None
+
+@st.cache_data(ttl=60)
+def get_category_feedback(category, rating=None, search=None, mess_type=None):
+    """Get the entries with comments on a category, optionally filtered by rating, comment text and mess type"""
+    if category not in FEEDBACK_CATEGORIES:
+        raise ValueError(f"Unknown feedback category: {category}")
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                type_column = "mess_type, " if category == 'mess' else ""
+                query = f"""
+                SELECT username, timestamp, {category}_feedback, {type_column}{category}_rating, other_comments
                 FROM feedback 
-                WHERE mess_feedback IS NOT NULL AND mess_feedback != ''
-                ORDER BY timestamp DESC
+                WHERE {category}_feedback IS NOT NULL AND {category}_feedback != ''
                 """
-                cursor.execute(query)
-                results = cursor.fetchall()
-                
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
-    except sqlite3.Error as e:
-        st.error(f"Error getting mess feedback: {e}")
+                params = []
+                # Only add the conditions in use so the rating indexes stay usable
+                if rating:
+                    query += f" AND {category}_rating = ?"
+                    params.append(rating)
+                if mess_type:
+                    query += " AND mess_type = ?"
+                    params.append(mess_type)
+                if search:
+                    query += f" AND {category}_feedback LIKE ? ESCAPE '\\'"
+                    params.append(like_pattern(search))
+                query += " ORDER BY timestamp DESC"
+                return with_feedback_dtypes(pd.read_sql_query(query, connection, params=params))
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        st.error(f"Error getting {category} feedback: {e}")
     return pd.DataFrame()
 
-def get_bathroom_feedback():
-    """Get bathroom-specific feedback entries"""
+def get_hostel_feedback(rating=None, search=None):
+    """Get hostel-specific feedback entries, optionally filtered by rating and comment text"""
+    return get_category_feedback('hostel', rating=rating, search=search)
+
+def get_mess_feedback(rating=None, mess_type=None, search=None):
+    """Get mess-specific feedback entries, optionally filtered by rating, mess type and comment text"""
+    return get_category_feedback('mess', rating=rating, search=search, mess_type=mess_type)
+
+def get_bathroom_feedback(rating=None, search=None):
+    """Get bathroom-specific feedback entries, optionally filtered by rating and comment text"""
+    return get_category_feedback('bathroom', rating=rating, search=search)
+
+@st.cache_data(ttl=60)
+def get_all_rating_statistics():
+    """Get the rating distributions of every feedback category in one query"""
     try:
         with get_db_connection() as connection:
             if connection:
-                cursor = connection.cursor()
                 query = """
-                SELECT username, timestamp, bathroom_feedback, bathroom_rating, other_comments
-                FROM feedback 
-                WHERE bathroom_feedback IS NOT NULL AND bathroom_feedback != ''
-                ORDER BY timestamp DESC
+                SELECT 'hostel' AS kind, hostel_rating AS rating, COUNT(*) AS count
+                FROM feedback GROUP BY hostel_rating
+                UNION ALL
+                SELECT 'mess', mess_rating, COUNT(*) FROM feedback GROUP BY mess_rating
+                UNION ALL
+                SELECT 'bathroom', bathroom_rating, COUNT(*) FROM feedback GROUP BY bathroom_rating
+                ORDER BY kind, rating
                 """
-                cursor.execute(query)
-                results = cursor.fetchall()
-                
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
-    except sqlite3.Error as e:
-        st.error(f"Error getting bathroom feedback: {e}")
-    return pd.DataFrame()
+                return pd.read_sql_query(query, connection)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        st.error(f"Error getting rating statistics: {e}")
+    return pd.DataFrame(columns=['kind', 'rating', 'count'])
 
 def get_rating_statistics(rating_type):
     """Get rating statistics for visualization"""
+    if rating_type not in FEEDBACK_CATEGORIES:
+        raise ValueError(f"Unknown rating type: {rating_type}")
+    stats = get_all_rating_statistics()
+    return stats.loc[stats['kind'] == rating_type, ['rating', 'count']].reset_index(drop=True)
+
+def get_most_common_rating(rating_type):
+    """Get the most frequent rating of a category across all feedback"""
+    stats = get_rating_statistics(rating_type)
+    return stats.loc[stats['count'].idxmax(), 'rating'] if not stats.empty else 'N/A'
+
+@st.cache_data(ttl=60)
+def get_most_common_commented_rating(category):
+    """Get the most frequent rating among feedback entries with comments for a category"""
+    if category not in FEEDBACK_CATEGORIES:
+        raise ValueError(f"Unknown feedback category: {category}")
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                cursor = connection.cursor()
+                # Ties go to the lowest rating, as pandas' mode() did
+                cursor.execute(f"""
+                    SELECT {category}_rating FROM feedback
+                    WHERE {category}_feedback IS NOT NULL AND {category}_feedback != ''
+                    GROUP BY {category}_rating
+                    ORDER BY COUNT(*) DESC, {category}_rating
+                    LIMIT 1
+                """)
+                row = cursor.fetchone()
+                return row[0] if row else 'N/A'
+    except sqlite3.Error as e:
+        st.error(f"Error getting most common rating: {e}")
+    return 'N/A'
+
+@st.cache_data(ttl=60)
+def get_mess_type_counts():
+    """Get the number of mess feedback entries per mess type, most common first"""
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    SELECT mess_type, COUNT(*) FROM feedback
+                    WHERE mess_feedback IS NOT NULL AND mess_feedback != ''
+                    GROUP BY mess_type
+                    ORDER BY COUNT(*) DESC, mess_type
+                """)
+                counts = pd.DataFrame(cursor.fetchall(), columns=['mess_type', 'count'])
+                return counts.set_index('mess_type')['count'].astype('int64')
+    except sqlite3.Error as e:
+        st.error(f"Error getting mess type counts: {e}")
+    return pd.Series(name='count', dtype='int64')
+
+@st.cache_data(ttl=30)
+def get_latest_date(category):
+    """Get the date of the most recent feedback for a category"""
+    if category not in FEEDBACK_CATEGORIES:
+        raise ValueError(f"Unknown feedback category: {category}")
     try:
         with get_db_connection() as connection:
             if connection:
                 cursor = connection.cursor()
                 query = f"""
-                SELECT {rating_type}_rating as rating, COUNT(*) as count
+                SELECT date(MAX(timestamp))
                 FROM feedback 
-                GROUP BY {rating_type}_rating
-                ORDER BY rating
+                WHERE {category}_feedback IS NOT NULL AND {category}_feedback != ''
                 """
                 cursor.execute(query)
-                results = cursor.fetchall()
-                
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
+                latest = cursor.fetchone()[0]
+                return latest or 'N/A'
     except sqlite3.Error as e:
-        st.error(f"Error getting rating statistics: {e}")
-    return pd.DataFrame()
+        st.error(f"Error getting latest feedback date: {e}")
+    return 'N/A'
 
-def get_all_users():
-    """Get all users (without passwords)"""
+@st.cache_data(ttl=30)
+def get_latest_log_date():
+    """Get the date of the most recent admin log entry"""
     try:
         with get_db_connection() as connection:
             if connection:
                 cursor = connection.cursor()
+                cursor.execute("SELECT date(MAX(timestamp)) FROM admin_logs")
+                latest = cursor.fetchone()[0]
+                return latest or 'N/A'
+    except sqlite3.Error as e:
+        st.error(f"Error getting latest log date: {e}")
+    return 'N/A'
+
+@st.cache_data(ttl=60)
+def get_all_users(before_id=None, limit=PAGE_SIZE):
+    """Get one page of users (without passwords), newest first"""
+    try:
+        with get_db_connection() as connection:
+            if connection:
                 query = """
-                SELECT username, name, email, reg_no, room_no, last_login, created_at 
+                SELECT id, username, name, email, reg_no, room_no, last_login, created_at 
                 FROM users 
-                ORDER BY created_at DESC
+                WHERE (? IS NULL OR id < ?)
+                ORDER BY id DESC
+                LIMIT ?
                 """
-                cursor.execute(query)
-                results = cursor.fetchall()
-                
-                # Convert to list of dictionaries
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
-    except sqlite3.Error as e:
+                return pd.read_sql_query(query, connection, params=(before_id, before_id, limit))
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
         st.error(f"Error getting all users: {e}")
     return pd.DataFrame()
 
-def get_admin_logs():
-    """Get all admin logs"""
+@st.cache_data(ttl=60)
+def get_users_export():
+    """Get every user (without passwords), unpaginated, for CSV export"""
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                query = """
+                SELECT id, username, name, email, reg_no, room_no, last_login, created_at 
+                FROM users 
+                ORDER BY id DESC
+                """
+                return pd.read_sql_query(query, connection)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        st.error(f"Error exporting users: {e}")
+    return pd.DataFrame()
+
+def get_admin_logs(before_id=None, limit=PAGE_SIZE):
+    """Get one page of admin logs, newest first"""
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                query = """
+                SELECT * FROM admin_logs 
+                WHERE (? IS NULL OR id < ?)
+                ORDER BY id DESC
+                LIMIT ?
+                """
+                return pd.read_sql_query(query, connection, params=(before_id, before_id, limit))
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        st.error(f"Error getting admin logs: {e}")
+    return pd.DataFrame()
+
+def get_admin_logs_export():
+    """Get every admin log entry, unpaginated, for CSV export"""
+    try:
+        with get_db_connection() as connection:
+            if connection:
+                return pd.read_sql_query("SELECT * FROM admin_logs ORDER BY id DESC", connection)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        st.error(f"Error exporting admin logs: {e}")
+    return pd.DataFrame()
+
+def get_log_action_counts():
+    """Get admin log counts per action from the running totals table"""
     try:
         with get_db_connection() as connection:
             if connection:
                 cursor = connection.cursor()
-                cursor.execute("SELECT * FROM admin_logs ORDER BY timestamp DESC")
+                cursor.execute("SELECT action, cnt FROM log_action_counts WHERE cnt > 0 ORDER BY cnt DESC")
                 results = cursor.fetchall()
-                
-                # Convert to list of dictionaries
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in results]
-                return pd.DataFrame(data)
+                counts = pd.DataFrame(results, columns=['action', 'count'])
+                return counts.set_index('action')['count'].astype('int64')
     except sqlite3.Error as e:
-        st.error(f"Error getting admin logs: {e}")
-    return pd.DataFrame()
+        st.error(f"Error getting log action counts: {e}")
+    return pd.Series(name='count', dtype='int64')
+
+def clear_query_cache():
+    """Drop memoized read results after a database write"""
+    for cached_read in (get_dashboard_stats, get_all_hostels, get_all_rooms, get_all_guests,
+                        get_guests_without_room, get_current_stays,
+                        get_recent_feedback, get_all_feedback_summary, count_feedback,
+                        get_feedback_export, get_category_feedback, get_all_rating_statistics,
+                        get_most_common_commented_rating, get_mess_type_counts,
+                        get_latest_date, get_all_users, get_users_export):
+        cached_read.clear()
+
+def load_pages(key, fetch_page):
+    """Fetch as many keyset pages as the viewer has requested via "Load more"
+
+    Returns the loaded rows and whether another page may follow.
+    """
+    frames = []
+    before_id = None
+    for _ in range(st.session_state.get(key, 1)):
+        page = fetch_page(before_id=before_id, limit=PAGE_SIZE)
+        frames.append(page)
+        if len(page) < PAGE_SIZE:
+            return pd.concat(frames, ignore_index=True), False
+        before_id = int(page['id'].min())
+    return pd.concat(frames, ignore_index=True), True
+
+def load_more_button(key):
+    """Render a "Load more" button that requests one more page on the next run"""
+    if st.button("⬇️ Load more", key=f"{key}_more"):
+        st.session_state[key] = st.session_state.get(key, 1) + 1
+        st.rerun()
 
 # ======================
 # AUTHENTICATION FUNCTIONS
@@ -506,28 +916,34 @@ def get_admin_logs():
 def authenticate_admin(username, password):
     """Verify admin credentials"""
     return (username == ADMIN_USERNAME and 
-            hash_password(password) == ADMIN_PASSWORD_HASH)
+            hmac.compare_digest(hash_password(password), ADMIN_PASSWORD_HASH))
 
 def authenticate_user(username, password):
     """Verify student credentials"""
     try:
+        with get_db_connection() as connection:
+            if not connection:
+                return False
+            result = connection.execute(
+                "SELECT password FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        
+        # Verify outside the connection lock; Argon2 is deliberately slow
+        if not result or not verify_user_password(result['password'], password):
+            return False
+        
+        # Upgrade legacy or outdated hashes while the plaintext is at hand
+        new_hash = hash_user_password(password) if password_needs_rehash(result['password']) else None
         with get_db_connection() as connection:
             if connection:
-                cursor = connection.cursor()
-                cursor.execute(
-                    "SELECT username FROM users WHERE username = ? AND password = ?",
-                    (username, hash_password(password))
-                )
-                result = cursor.fetchone()
-                
-                if result:
-                    # Update last login
-                    cursor.execute(
-                        "UPDATE users SET last_login = ? WHERE username = ?",
-                        (datetime.now().isoformat(), username)
-                    )
-                    connection.commit()
-                    return True
+                connection.execute("""
+                    UPDATE users SET last_login = strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'),
+                                     password = COALESCE(?, password)
+                    WHERE username = ?
+                """, (new_hash, username))
+                get_all_users.clear()
+                get_dashboard_stats.clear()
+                return True
     except sqlite3.Error as e:
         st.error(f"Authentication error: {e}")
     return False
@@ -535,11 +951,20 @@ def authenticate_user(username, password):
 def register_user(username, password, user_data):
     """Register new student and create guest record"""
     try:
+        # Reject taken usernames before paying for the deliberately slow Argon2 hash
         with get_db_connection() as connection:
+            if connection and connection.execute(
+                "SELECT 1 FROM users WHERE username = ?", (username,)
+            ).fetchone():
+                return False, "Username already exists"
+        
+        # Hash before taking the connection lock again
+        password_hash = hash_user_password(password)
+        with db_transaction() as connection:
             if connection:
                 cursor = connection.cursor()
                 
-                # Check if username already exists
+                # Re-check inside the transaction in case of a concurrent registration
                 cursor.execute("SELECT username FROM users WHERE username = ?", (username,))
                 if cursor.fetchone():
                     return False, "Username already exists"
@@ -550,7 +975,7 @@ def register_user(username, password, user_data):
                     VALUES (?, ?, ?, ?, ?, ?)
                 """, (
                     username, 
-                    hash_password(password),
+                    password_hash,
                     user_data['name'],
                     user_data['email'],
                     user_data['reg_no'],
@@ -570,21 +995,21 @@ def register_user(username, password, user_data):
                     user_id
                 ))
                 
-                connection.commit()
+                clear_query_cache()
                 return True, "Registration successful"
                 
     except sqlite3.Error as e:
         return False, f"Registration error: {e}"
 
 def delete_user(username):
-    """Delete a user from database (cascades to guest and stays)"""
+    """Delete a user from database (cascades to guest and stays); False if there is no such user"""
     try:
         with get_db_connection() as connection:
             if connection:
                 cursor = connection.cursor()
                 cursor.execute("DELETE FROM users WHERE username = ?", (username,))
-                connection.commit()
-                return True
+                clear_query_cache()
+                return cursor.rowcount > 0
     except sqlite3.Error as e:
         st.error(f"Error deleting user: {e}")
     return False
@@ -599,7 +1024,7 @@ def add_hostel(name, location):
             if connection:
                 cursor = connection.cursor()
                 cursor.execute("INSERT INTO hostel (name, location) VALUES (?, ?)", (name, location))
-                connection.commit()
+                clear_query_cache()
                 return True
     except sqlite3.Error as e:
         st.error(f"Error adding hostel: {e}")
@@ -613,7 +1038,7 @@ def add_room(room_number, room_type, hostel_id):
                 cursor = connection.cursor()
                 cursor.execute("INSERT INTO room (room_number, type, hostel_id) VALUES (?, ?, ?)", 
                              (room_number, room_type, hostel_id))
-                connection.commit()
+                clear_query_cache()
                 return True
     except sqlite3.Error as e:
         st.error(f"Error adding room: {e}")
@@ -622,14 +1047,14 @@ def add_room(room_number, room_type, hostel_id):
 def assign_room_to_guest(guest_id, room_id, check_in_date):
     """Assign a room to a guest"""
     try:
-        with get_db_connection() as connection:
+        with db_transaction() as connection:
             if connection:
                 cursor = connection.cursor()
                 cursor.execute("""
                     INSERT INTO stays_in_room (guest_id, room_id, check_in_date) 
                     VALUES (?, ?, ?)
                 """, (guest_id, room_id, check_in_date))
-                connection.commit()
+                clear_query_cache()
                 return True
     except sqlite3.Error as e:
         st.error(f"Error assigning room: {e}")
@@ -638,7 +1063,7 @@ def assign_room_to_guest(guest_id, room_id, check_in_date):
 def checkout_guest(guest_id, room_id, check_out_date):
     """Checkout a guest from room"""
     try:
-        with get_db_connection() as connection:
+        with db_transaction() as connection:
             if connection:
                 cursor = connection.cursor()
                 cursor.execute("""
@@ -646,7 +1071,7 @@ def checkout_guest(guest_id, room_id, check_out_date):
                     SET check_out_date = ? 
                     WHERE guest_id = ? AND room_id = ? AND check_out_date IS NULL
                 """, (check_out_date, guest_id, room_id))
-                connection.commit()
+                clear_query_cache()
                 return True
     except sqlite3.Error as e:
         st.error(f"Error checking out guest: {e}")
@@ -655,31 +1080,100 @@ def checkout_guest(guest_id, room_id, check_out_date):
 # ======================
 # FEEDBACK FUNCTIONS
 # ======================
+FEEDBACK_INSERT_SQL = """
+    INSERT INTO feedback (
+        username, timestamp, hostel_feedback, hostel_rating,
+        mess_feedback, mess_type, mess_rating, bathroom_feedback,
+        bathroom_rating, other_comments
+    ) VALUES (?, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'), ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _feedback_row(username, feedback_data):
+    """Build the FEEDBACK_INSERT_SQL parameters for one submission"""
+    return (
+        username,
+        feedback_data['hostel_feedback'],
+        feedback_data['hostel_rating'],
+        feedback_data['mess_feedback'],
+        feedback_data['mess_type'],
+        feedback_data['mess_rating'],
+        feedback_data['bathroom_feedback'],
+        feedback_data['bathroom_rating'],
+        feedback_data['other_comments']
+    )
+
+def _write_feedback_batch(connection, lock, rows):
+    """Insert queued feedback rows in a single BEGIN IMMEDIATE ... COMMIT"""
+    with lock:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(FEEDBACK_INSERT_SQL, rows)
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+
+def _feedback_writer(feedback_queue, connection, lock):
+    """Drain queued feedback rows into the database, one transaction per batch"""
+    while True:
+        batch = [feedback_queue.get()]
+        deadline = time.monotonic() + FEEDBACK_FLUSH_SECONDS
+        while len(batch) < FEEDBACK_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(feedback_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            try:
+                _write_feedback_batch(connection, lock, batch)
+            except sqlite3.IntegrityError:
+                # One bad row must not sink the rest of the batch
+                for row in batch:
+                    try:
+                        _write_feedback_batch(connection, lock, [row])
+                    except sqlite3.IntegrityError as e:
+                        logger.error("Dropping queued feedback from %s: %s", row[0], e)
+            clear_query_cache()
+        except sqlite3.Error as e:
+            logger.error("Error writing %d queued feedback rows: %s", len(batch), e)
+        except Exception:
+            # Keep the writer alive; otherwise every later submission is silently lost
+            logger.exception("Unexpected error writing %d queued feedback rows", len(batch))
+        finally:
+            for _ in batch:
+                feedback_queue.task_done()
+
+@st.cache_resource
+def get_feedback_queue():
+    """Start the background feedback writer once per server process and return its queue"""
+    feedback_queue = queue.Queue()
+    threading.Thread(
+        target=_feedback_writer,
+        args=(feedback_queue, get_conn(), get_db_lock()),
+        name="feedback-writer",
+        daemon=True
+    ).start()
+    return feedback_queue
+
 def submit_feedback(username, feedback_data):
-    """Submit new feedback"""
+    """Queue new feedback for the background writer"""
+    get_feedback_queue().put(_feedback_row(username, feedback_data))
+    return True
+
+def submit_feedback_many(rows):
+    """Submit several (username, feedback_data) pairs in a single transaction"""
     try:
-        with get_db_connection() as connection:
+        with db_transaction() as connection:
             if connection:
                 cursor = connection.cursor()
-                cursor.execute("""
-                    INSERT INTO feedback (
-                        username, timestamp, hostel_feedback, hostel_rating,
-                        mess_feedback, mess_type, mess_rating, bathroom_feedback,
-                        bathroom_rating, other_comments
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    username,
-                    datetime.now().isoformat(),
-                    feedback_data['hostel_feedback'],
-                    feedback_data['hostel_rating'],
-                    feedback_data['mess_feedback'],
-                    feedback_data['mess_type'],
-                    feedback_data['mess_rating'],
-                    feedback_data['bathroom_feedback'],
-                    feedback_data['bathroom_rating'],
-                    feedback_data['other_comments']
-                ))
-                connection.commit()
+                cursor.executemany(
+                    FEEDBACK_INSERT_SQL,
+                    [_feedback_row(username, feedback_data) for username, feedback_data in rows]
+                )
+                clear_query_cache()
                 return True
     except sqlite3.Error as e:
         st.error(f"Error submitting feedback: {e}")
@@ -688,11 +1182,13 @@ def submit_feedback(username, feedback_data):
 def clear_admin_logs():
     """Clear all admin logs"""
     try:
-        with get_db_connection() as connection:
+        # The log rows and their running totals are cleared in one commit
+        with db_transaction() as connection:
             if connection:
                 cursor = connection.cursor()
                 cursor.execute("DELETE FROM admin_logs")
-                connection.commit()
+                cursor.execute("DELETE FROM log_action_counts")
+                clear_query_cache()
                 return True
     except sqlite3.Error as e:
         st.error(f"Error clearing logs: {e}")
@@ -707,17 +1203,17 @@ def show_admin_sidebar():
     st.sidebar.success("✅ Admin Logged In")
     
     if st.sidebar.button("🔄 Refresh Data"):
+        # Drop memoized reads so the viewers refilter fresh data
+        clear_query_cache()
         st.rerun()
     
     st.sidebar.divider()
     if st.sidebar.button("🚪 Logout Admin", type="primary"):
         # Clear admin session
-        st.session_state.logged_in = False
+        st.session_state.role = 'guest'
         st.session_state.current_user = None
-        st.session_state.is_admin = False
         log_admin_action("ADMIN_LOGOUT")
-        st.success("Admin logged out successfully!")
-        time.sleep(1)
+        st.toast("Admin logged out successfully!", icon="✅")
         st.rerun()
 
 def show_user_sidebar():
@@ -729,13 +1225,15 @@ def show_user_sidebar():
     
     if st.sidebar.button("🚪 Logout"):
         # Clear login session
-        st.session_state.logged_in = False
+        st.session_state.role = 'guest'
         st.session_state.current_user = None
-        st.session_state.is_admin = False
-        st.success("Logged out successfully!")
-        time.sleep(1)
+        st.toast("Logged out successfully!", icon="✅")
         st.rerun()
 
+def show_guest_sidebar():
+    """Sidebar shown before login"""
+    st.sidebar.info("Please login to access all features")
+
 def render_login_page():
     """Login page with tabs for admin/student"""
     st.title("🔒 Authentication")
@@ -749,10 +1247,9 @@ def render_login_page():
             
             if st.form_submit_button("Login", type="primary"):
                 if authenticate_user(username, password):
-                    st.session_state.logged_in = True
+                    st.session_state.role = 'user'
                     st.session_state.current_user = username
-                    st.success("Login successful!")
-                    time.sleep(1)
+                    st.toast("Login successful!", icon="✅")
                     st.rerun()
                 else:
                     st.error("Invalid credentials")
@@ -765,41 +1262,61 @@ def render_login_page():
             
             if st.form_submit_button("Admin Login", type="primary"):
                 if authenticate_admin(admin_user, admin_pass):
-                    st.session_state.is_admin = True
-                    st.session_state.logged_in = True
+                    st.session_state.role = 'admin'
                     st.session_state.current_user = "admin"
                     log_admin_action("ADMIN_LOGIN")
-                    st.success("Admin access granted!")
-                    time.sleep(1)
+                    st.toast("Admin access granted!", icon="✅")
                     st.rerun()
                 else:
                     st.error("Invalid admin credentials")
 
 def create_rating_chart(data, title):
-    """Create rating distribution chart using Streamlit native charts"""
+    """Create rating distribution chart as a single colour-coded Altair chart"""
     if data.empty:
         return None
     
-    # Create a bar chart using streamlit
     st.subheader(f"{title} Rating Distribution")
     
-    # Display as columns with metrics
-    cols = st.columns(len(data))
-    for idx, (_, row) in enumerate(data.iterrows()):
-        with cols[idx]:
-            # Color coding for ratings
-            if row['rating'] == 'A':
-                st.success(f"**{row['rating']}** - {int(row['count'])}")
-            elif row['rating'] == 'B':
-                st.info(f"**{row['rating']}** - {int(row['count'])}")
-            elif row['rating'] == 'C':
-                st.warning(f"**{row['rating']}** - {int(row['count'])}")
-            elif row['rating'] in ['D', 'E']:
-                st.error(f"**{row['rating']}** - {int(row['count'])}")
-    
-    # Display as bar chart
-    chart_data = data.set_index('rating')
-    st.bar_chart(chart_data)
+    # Colour coding for ratings, drawn in one component instead of one per rating
+    bars = alt.Chart(data).mark_bar().encode(
+        x=alt.X('rating:N', title='Rating', sort=list(RATING_COLORS)),
+        y=alt.Y('count:Q', title='Count'),
+        color=alt.Color(
+            'rating:N',
+            scale=alt.Scale(domain=list(RATING_COLORS), range=list(RATING_COLORS.values())),
+            legend=None
+        ),
+        tooltip=['rating', 'count']
+    )
+    labels = bars.mark_text(dy=-8).encode(text='count:Q')
+    st.altair_chart(bars + labels)
+
+@st.fragment
+def feedback_records_table(filtered_data):
+    """Selectable feedback table with a comment drill-down for the chosen row"""
+    # Selecting a row reruns only this fragment, not the rest of the page
+    st.caption("Select a row to read its comments")
+    selection = st.dataframe(
+        filtered_data,
+        column_config={
+            "id": "ID",
+            "timestamp": st.column_config.DatetimeColumn("Date & Time"),
+        },
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row"
+    )
+    
+    # Comment fields are only loaded for the selected entry
+    if selection.selection.rows:
+        feedback_id = int(filtered_data.iloc[selection.selection.rows[0]]['id'])
+        detail = get_feedback_detail(feedback_id)
+        if detail:
+            st.subheader(f"Feedback #{feedback_id} by {detail['username']}")
+            st.write(f"**Hostel Feedback:** {detail['hostel_feedback'] or '-'}")
+            st.write(f"**Mess Feedback:** {detail['mess_feedback'] or '-'}")
+            st.write(f"**Bathroom Feedback:** {detail['bathroom_feedback'] or '-'}")
+            st.write(f"**Other Comments:** {detail['other_comments'] or '-'}")
 
 # ======================
 # MAIN APPLICATION
@@ -808,63 +1325,22 @@ def main():
     # Initialize session state
     init_session_state()
     
-    # Initialize database on first run
-    if not st.session_state.db_initialized:
-        if initialize_database():
-            st.session_state.db_initialized = True
-        else:
-            st.error("Failed to initialize database.")
-            st.stop()
+    # Initialize database on first run; a failure is not cached so the next run retries
+    if not initialize_database():
+        initialize_database.clear()
+        st.error("Failed to initialize database.")
+        st.stop()
     
 
     # Sidebar Navigation
     st.sidebar.title("Hostel Feedback System")
     
-    # Show appropriate sidebar based on login state
-    if st.session_state.get('is_admin'):
-        show_admin_sidebar()
-    elif st.session_state.get('logged_in'):
-        show_user_sidebar()
-    else:
-        st.sidebar.info("Please login to access all features")
-    
-    # Navigation options based on authentication status
-    if st.session_state.get('is_admin'):
-        pages = {
-            "Dashboard": admin_dashboard,
-            "Hostel Management": hostel_management,
-            "Room Management": room_management,
-            "Guest Management": guest_management,
-            "Hostel Feedback": hostel_feedback_viewer,
-            "Mess Feedback": mess_feedback_viewer,
-            "Bathroom Feedback": bathroom_feedback_viewer,
-            "All Feedback": feedback_viewer,
-            "User Management": user_manager,
-            "System Logs": system_logs
-        }
-    elif st.session_state.get('logged_in'):
-        pages = {
-            "Home": home_page,
-            "Submit Feedback": feedback_page,
-            "FAQ": faq_page
-        }
-    else:
-        pages = {
-            "Home": home_page,
-            "Register": register_page,
-            "Login": render_login_page,
-            "FAQ": faq_page
-        }
+    # Sidebar and navigation options based on the signed-in role
+    role = st.session_state.role
+    SIDEBARS_BY_ROLE[role]()
     
-    # Handle page selection
-    page = st.sidebar.selectbox("Menu", list(pages.keys()))
-    
-    # Execute the selected page function
-    try:
-        pages[page]()
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-        st.info("Please try refreshing the page or contact support.")
+    # Only the selected page function is executed
+    st.navigation([st.Page(page, title=title) for page, title in PAGES_BY_ROLE[role]]).run()
 
 # ======================
 # PAGE COMPONENTS
@@ -887,12 +1363,14 @@ def home_page():
         
     with col2:
         if lottie_feedback := load_lottieurl("https://assets6.lottiefiles.com/packages/lf20_szdrhwiq.json"):
-            st_lottie(lottie_feedback, height=300)
+            # Play once and keep a stable key so reruns do not remount the animation
+            st_lottie(lottie_feedback, height=300, loop=False, key="home_lottie")
 
 def register_page():
     st.title("📝 Student Registration")
     
-    with st.form("registration_form"):
+    # Fields are kept on a failed attempt so only the bad one needs fixing
+    with st.form("registration_form", enter_to_submit=False):
         st.subheader("Personal Information")
         col1, col2 = st.columns(2)
         with col1:
@@ -907,7 +1385,7 @@ def register_page():
         confirm_pass = st.text_input("Confirm Password", type="password")
         
         if st.form_submit_button("Register Account"):
-            if not all([full_name, username, reg_number, room_number, email, password, confirm_pass]):
+            if not (full_name and username and reg_number and room_number and email and password and confirm_pass):
                 st.error("Please fill in all fields!")
             elif password != confirm_pass:
                 st.error("Passwords don't match!")
@@ -920,35 +1398,32 @@ def register_page():
                 }
                 success, message = register_user(username, password, user_data)
                 if success:
-                    st.success(message + " Please login.")
-                    st.info("Redirecting to login page...")
-                    time.sleep(2)
-                    st.session_state.show_login = True
-                    st.rerun()
+                    st.toast(f"{message}. Please login.", icon="✅")
+                    st.switch_page(st.Page(render_login_page, title="Login"))
                 else:
                     st.error(message)
 
 def feedback_page():
-    if not st.session_state.get('logged_in'):
+    if st.session_state.get('role') != 'user':
         st.warning("Please login first")
         return
     
     st.title("📝 Submit Feedback")
     st.write(f"Welcome back, {st.session_state.current_user}!")
     
-    with st.form("feedback_form"):
+    with st.form("feedback_form", clear_on_submit=True, enter_to_submit=False):
         st.subheader("Hostel Facilities")
         hostel_feedback = st.text_area("Comments about hostel")
-        hostel_rating = st.selectbox("Overall Rating", ["A", "B", "C", "D", "E"])
+        hostel_rating = st.selectbox("Overall Rating", RATINGS)
         
         st.subheader("Mess Food Quality")
-        mess_type = st.radio("Food Type", ["Veg", "Non-Veg", "Special","Food-Park"])
+        mess_type = st.radio("Food Type", MESS_TYPES)
         mess_feedback = st.text_area("Comments about mess food")
-        mess_rating = st.selectbox("Food Rating", ["A", "B", "C", "D", "E"])
+        mess_rating = st.selectbox("Food Rating", RATINGS)
         
         st.subheader("Bathroom Cleanliness")
         bathroom_feedback = st.text_area("Bathroom comments")
-        bathroom_rating = st.selectbox("Cleanliness Rating", ["A", "B", "C", "D", "E"])
+        bathroom_rating = st.selectbox("Cleanliness Rating", RATINGS)
         
         other_comments = st.text_area("Other suggestions")
         
@@ -972,44 +1447,34 @@ def feedback_page():
 def faq_page():
     st.title("❓ Frequently Asked Questions")
     
-    with st.expander("How do I submit feedback?"):
-        st.write("After logging in, go to 'Submit Feedback' and fill out the form.")
-    
-    with st.expander("What do the ratings mean?"):
-        st.write("""
-        - A: Excellent
-        - B: Good
-        - C: Average
-        - D: Below average
-        - E: Poor
-        """)
-    
-    with st.expander("Who can view my feedback?"):
-        st.write("Only authorized administrators can view feedback with strict confidentiality.")
+    for question, answer in FAQ_ENTRIES:
+        with st.expander(question):
+            st.markdown(answer)
 
 # ======================
 # ADMIN PAGES
 # ======================
 def admin_dashboard():
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
     st.title("📊 Admin Dashboard")
     
     # Updated dashboard with new E-R entities
+    stats = get_dashboard_stats()
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Users", get_user_count())
-        st.metric("Total Guests", get_guest_count())
+        st.metric("Total Users", stats['users'])
+        st.metric("Total Guests", stats['guests'])
         
     with col2:
-        st.metric("Total Hostels", get_hostel_count())
-        st.metric("Total Rooms", get_room_count())
+        st.metric("Total Hostels", stats['hostels'])
+        st.metric("Total Rooms", stats['rooms'])
         
     with col3:
-        st.metric("Total Feedback", get_feedback_count())
+        st.metric("Total Feedback", stats['feedback'])
         
     with col4:
         if lottie_admin := load_lottieurl("https://assets1.lottiefiles.com/packages/lf20_hu9uedjd.json"):
@@ -1024,7 +1489,7 @@ def admin_dashboard():
 
 def hostel_management():
     """Manage hostels according to E-R diagram"""
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
@@ -1069,7 +1534,7 @@ def hostel_management():
 
 def room_management():
     """Manage rooms according to E-R diagram"""
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
@@ -1116,7 +1581,8 @@ def room_management():
                 "room_number": "Room Number",
                 "type": "Type",
                 "hostel_name": "Hostel",
-                "location": "Location"
+                "location": "Location",
+                "label": None
             },
             hide_index=True
         )
@@ -1125,7 +1591,7 @@ def room_management():
 
 def guest_management():
     """Manage guests and their room assignments"""
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
@@ -1143,7 +1609,7 @@ def guest_management():
             
             with col1:
                 # Get guests without current room assignment
-                available_guests = guests_data[guests_data['room_number'].isna()]
+                available_guests = get_guests_without_room()
                 if not available_guests.empty:
                     guest_options = dict(zip(available_guests['name'], available_guests['guest_id']))
                     selected_guest = st.selectbox("Select Guest", list(guest_options.keys()))
@@ -1153,10 +1619,7 @@ def guest_management():
             
             with col2:
                 if selected_guest:
-                    room_options = dict(zip(
-                        rooms_data['room_number'] + " (" + rooms_data['hostel_name'] + ")", 
-                        rooms_data['room_id']
-                    ))
+                    room_options = dict(zip(rooms_data['label'], rooms_data['room_id']))
                     selected_room = st.selectbox("Select Room", list(room_options.keys()))
                 else:
                     selected_room = None
@@ -1177,7 +1640,7 @@ def guest_management():
     
     # Checkout section
     st.subheader("Guest Checkout")
-    current_stays = guests_data[guests_data['check_out_date'].isna() & guests_data['room_number'].notna()]
+    current_stays = get_current_stays()
     
     if not current_stays.empty:
         with st.form("checkout_form"):
@@ -1185,8 +1648,8 @@ def guest_management():
             
             with col1:
                 checkout_options = dict(zip(
-                    current_stays['name'] + " (Room " + current_stays['room_number'].astype(str) + ")",
-                    zip(current_stays['guest_id'], current_stays['room_number'])
+                    current_stays['label'],
+                    zip(current_stays['guest_id'], current_stays['room_id'])
                 ))
                 selected_checkout = st.selectbox("Select Guest to Checkout", list(checkout_options.keys()))
             
@@ -1194,9 +1657,7 @@ def guest_management():
                 checkout_date = st.date_input("Checkout Date", datetime.now().date())
             
             if st.form_submit_button("Checkout Guest") and selected_checkout:
-                guest_id, room_number = checkout_options[selected_checkout]
-                # Find room_id from room_number
-                room_id = rooms_data[rooms_data['room_number'] == room_number]['room_id'].iloc[0]
+                guest_id, room_id = checkout_options[selected_checkout]
                 
                 if checkout_guest(guest_id, room_id, checkout_date):
                     st.success("Guest checked out successfully!")
@@ -1226,9 +1687,49 @@ def guest_management():
     else:
         st.info("No guests found")
 
+@st.fragment
+def hostel_feedback_records():
+    """Filterable hostel feedback table; applying filters reruns only this fragment"""
+    # Detailed Feedback Table
+    st.subheader("Detailed Hostel Feedback")
+    
+    # Add filters (only applied when the form is submitted)
+    with st.form("hostel_filters"):
+        col1, col2 = st.columns(2)
+        with col1:
+            rating_filter = st.selectbox("Filter by Rating", RATING_OPTIONS)
+        with col2:
+            search_term = st.text_input("Search in feedback")
+        st.form_submit_button("Apply")
+    
+    # Apply filters through the cached query; the form keeps its values until Apply
+    filtered_data = get_hostel_feedback(
+        rating=rating_filter if rating_filter != 'All' else None,
+        search=search_term or None
+    )
+    
+    st.dataframe(
+        filtered_data,
+        column_config={
+            "timestamp": st.column_config.DatetimeColumn("Date & Time"),
+            "hostel_feedback": st.column_config.TextColumn("Feedback", width="large"),
+            "hostel_rating": st.column_config.SelectboxColumn("Rating"),
+        },
+        hide_index=True
+    )
+    
+    # Export option
+    if not filtered_data.empty:
+        st.download_button(
+            "📥 Export Hostel Feedback as CSV",
+            dataframe_to_csv(filtered_data),
+            "hostel_feedback.csv",
+            "text/csv"
+        )
+
 def hostel_feedback_viewer():
     """View hostel-specific feedback"""
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
@@ -1246,42 +1747,48 @@ def hostel_feedback_viewer():
     with col1:
         st.metric("Total Hostel Feedback", len(hostel_data))
     with col2:
-        avg_rating = hostel_data['hostel_rating'].mode().iloc[0] if not hostel_data.empty else 'N/A'
-        st.metric("Most Common Rating", avg_rating)
+        st.metric("Most Common Rating", get_most_common_commented_rating('hostel'))
     with col3:
-        latest_feedback = hostel_data['timestamp'].max() if not hostel_data.empty else 'N/A'
-        st.metric("Latest Feedback", latest_feedback.split('T')[0] if latest_feedback != 'N/A' else 'N/A')
+        st.metric("Latest Feedback", get_latest_date('hostel'))
     
     # Rating Distribution Chart
     rating_stats = get_rating_statistics('hostel')
     if not rating_stats.empty:
         create_rating_chart(rating_stats, "Hostel")
     
+    hostel_feedback_records()
+
+@st.fragment
+def mess_feedback_records():
+    """Filterable mess feedback table; applying filters reruns only this fragment"""
     # Detailed Feedback Table
-    st.subheader("Detailed Hostel Feedback")
-    
-    # Add filters
-    col1, col2 = st.columns(2)
-    with col1:
-        rating_filter = st.selectbox("Filter by Rating", ['All'] + ['A', 'B', 'C', 'D', 'E'])
-    with col2:
-        search_term = st.text_input("Search in feedback")
+    st.subheader("Detailed Mess Feedback")
     
-    # Apply filters
-    filtered_data = hostel_data.copy()
-    if rating_filter != 'All':
-        filtered_data = filtered_data[filtered_data['hostel_rating'] == rating_filter]
-    if search_term:
-        filtered_data = filtered_data[
-            filtered_data['hostel_feedback'].str.contains(search_term, case=False, na=False)
-        ]
+    # Add filters (only applied when the form is submitted)
+    with st.form("mess_filters"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            rating_filter = st.selectbox("Filter by Rating", RATING_OPTIONS)
+        with col2:
+            type_filter = st.selectbox("Filter by Mess Type", MESS_TYPE_OPTIONS)
+        with col3:
+            search_term = st.text_input("Search in feedback")
+        st.form_submit_button("Apply")
+    
+    # Apply filters through the cached query; the form keeps its values until Apply
+    filtered_data = get_mess_feedback(
+        rating=rating_filter if rating_filter != 'All' else None,
+        mess_type=type_filter if type_filter != 'All' else None,
+        search=search_term or None
+    )
     
     st.dataframe(
         filtered_data,
         column_config={
             "timestamp": st.column_config.DatetimeColumn("Date & Time"),
-            "hostel_feedback": st.column_config.TextColumn("Feedback", width="large"),
-            "hostel_rating": st.column_config.SelectboxColumn("Rating"),
+            "mess_feedback": st.column_config.TextColumn("Feedback", width="large"),
+            "mess_type": st.column_config.SelectboxColumn("Mess Type"),
+            "mess_rating": st.column_config.SelectboxColumn("Rating"),
         },
         hide_index=True
     )
@@ -1289,15 +1796,15 @@ def hostel_feedback_viewer():
     # Export option
     if not filtered_data.empty:
         st.download_button(
-            "📥 Export Hostel Feedback as CSV",
-            filtered_data.to_csv(index=False),
-            "hostel_feedback.csv",
+            "📥 Export Mess Feedback as CSV",
+            dataframe_to_csv(filtered_data),
+            "mess_feedback.csv",
             "text/csv"
         )
 
 def mess_feedback_viewer():
     """View mess-specific feedback"""
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
@@ -1310,19 +1817,18 @@ def mess_feedback_viewer():
         st.info("No mess feedback submissions yet")
         return
     
-    # Statistics
+    # Statistics (mess type counts are aggregated in SQL and cached)
+    mess_type_counts = get_mess_type_counts()
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("Total Mess Feedback", len(mess_data))
     with col2:
-        avg_rating = mess_data['mess_rating'].mode().iloc[0] if not mess_data.empty else 'N/A'
-        st.metric("Most Common Rating", avg_rating)
+        st.metric("Most Common Rating", get_most_common_commented_rating('mess'))
     with col3:
-        popular_type = mess_data['mess_type'].mode().iloc[0] if not mess_data.empty else 'N/A'
+        popular_type = mess_type_counts.index[0] if not mess_type_counts.empty else 'N/A'
         st.metric("Popular Mess Type", popular_type)
     with col4:
-        latest_feedback = mess_data['timestamp'].max() if not mess_data.empty else 'N/A'
-        st.metric("Latest Feedback", latest_feedback.split('T')[0] if latest_feedback != 'N/A' else 'N/A')
+        st.metric("Latest Feedback", get_latest_date('mess'))
     
     # Rating Distribution Chart
     rating_stats = get_rating_statistics('mess')
@@ -1331,7 +1837,6 @@ def mess_feedback_viewer():
     
     # Mess Type Distribution
     st.subheader("Mess Type Distribution")
-    mess_type_counts = mess_data['mess_type'].value_counts()
     if not mess_type_counts.empty:
         col1, col2 = st.columns(2)
         with col1:
@@ -1340,36 +1845,35 @@ def mess_feedback_viewer():
         with col2:
             st.bar_chart(mess_type_counts)
     
+    mess_feedback_records()
+
+@st.fragment
+def bathroom_feedback_records():
+    """Filterable bathroom feedback table; applying filters reruns only this fragment"""
     # Detailed Feedback Table
-    st.subheader("Detailed Mess Feedback")
+    st.subheader("Detailed Bathroom Feedback")
     
-    # Add filters
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        rating_filter = st.selectbox("Filter by Rating", ['All'] + ['A', 'B', 'C', 'D', 'E'])
-    with col2:
-        type_filter = st.selectbox("Filter by Mess Type", ['All'] + ['Veg', 'Non-Veg', 'Special', 'Food-Park'])
-    with col3:
-        search_term = st.text_input("Search in feedback")
-    
-    # Apply filters
-    filtered_data = mess_data.copy()
-    if rating_filter != 'All':
-        filtered_data = filtered_data[filtered_data['mess_rating'] == rating_filter]
-    if type_filter != 'All':
-        filtered_data = filtered_data[filtered_data['mess_type'] == type_filter]
-    if search_term:
-        filtered_data = filtered_data[
-            filtered_data['mess_feedback'].str.contains(search_term, case=False, na=False)
-        ]
+    # Add filters (only applied when the form is submitted)
+    with st.form("bathroom_filters"):
+        col1, col2 = st.columns(2)
+        with col1:
+            rating_filter = st.selectbox("Filter by Rating", RATING_OPTIONS)
+        with col2:
+            search_term = st.text_input("Search in feedback")
+        st.form_submit_button("Apply")
+    
+    # Apply filters through the cached query; the form keeps its values until Apply
+    filtered_data = get_bathroom_feedback(
+        rating=rating_filter if rating_filter != 'All' else None,
+        search=search_term or None
+    )
     
     st.dataframe(
         filtered_data,
         column_config={
             "timestamp": st.column_config.DatetimeColumn("Date & Time"),
-            "mess_feedback": st.column_config.TextColumn("Feedback", width="large"),
-            "mess_type": st.column_config.SelectboxColumn("Mess Type"),
-            "mess_rating": st.column_config.SelectboxColumn("Rating"),
+            "bathroom_feedback": st.column_config.TextColumn("Feedback", width="large"),
+            "bathroom_rating": st.column_config.SelectboxColumn("Rating"),
         },
         hide_index=True
     )
@@ -1377,15 +1881,15 @@ def mess_feedback_viewer():
     # Export option
     if not filtered_data.empty:
         st.download_button(
-            "📥 Export Mess Feedback as CSV",
-            filtered_data.to_csv(index=False),
-            "mess_feedback.csv",
+            "📥 Export Bathroom Feedback as CSV",
+            dataframe_to_csv(filtered_data),
+            "bathroom_feedback.csv",
             "text/csv"
         )
 
 def bathroom_feedback_viewer():
     """View bathroom-specific feedback"""
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
@@ -1403,82 +1907,109 @@ def bathroom_feedback_viewer():
     with col1:
         st.metric("Total Bathroom Feedback", len(bathroom_data))
     with col2:
-        avg_rating = bathroom_data['bathroom_rating'].mode().iloc[0] if not bathroom_data.empty else 'N/A'
-        st.metric("Most Common Rating", avg_rating)
+        st.metric("Most Common Rating", get_most_common_commented_rating('bathroom'))
     with col3:
-        latest_feedback = bathroom_data['timestamp'].max() if not bathroom_data.empty else 'N/A'
-        st.metric("Latest Feedback", latest_feedback.split('T')[0] if latest_feedback != 'N/A' else 'N/A')
+        st.metric("Latest Feedback", get_latest_date('bathroom'))
     
     # Rating Distribution Chart
     rating_stats = get_rating_statistics('bathroom')
     if not rating_stats.empty:
         create_rating_chart(rating_stats, "Bathroom")
     
-    # Detailed Feedback Table
-    st.subheader("Detailed Bathroom Feedback")
-    
-    # Add filters
-    col1, col2 = st.columns(2)
-    with col1:
-        rating_filter = st.selectbox("Filter by Rating", ['All'] + ['A', 'B', 'C', 'D', 'E'])
-    with col2:
-        search_term = st.text_input("Search in feedback")
-    
-    # Apply filters
-    filtered_data = bathroom_data.copy()
-    if rating_filter != 'All':
-        filtered_data = filtered_data[filtered_data['bathroom_rating'] == rating_filter]
-    if search_term:
-        filtered_data = filtered_data[
-            filtered_data['bathroom_feedback'].str.contains(search_term, case=False, na=False)
-        ]
-    
-    st.dataframe(
-        filtered_data,
-        column_config={
-            "timestamp": st.column_config.DatetimeColumn("Date & Time"),
-            "bathroom_feedback": st.column_config.TextColumn("Feedback", width="large"),
-            "bathroom_rating": st.column_config.SelectboxColumn("Rating"),
-        },
-        hide_index=True
+    bathroom_feedback_records()
+
+@st.fragment
+def feedback_records_section(username_options):
+    """Filterable complete feedback records; applying filters reruns only this fragment"""
+    # Advanced Filters (only applied when the form is submitted)
+    st.subheader("Advanced Filtering")
+    with st.form("feedback_filters"):
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            date_filter = st.date_input("Filter by Date (from)")
+        with col2:
+            username_filter = st.selectbox("Filter by User", username_options)
+        with col3:
+            mess_type_filter = st.selectbox("Filter by Mess Type", MESS_TYPE_OPTIONS)
+        with col4:
+            overall_rating_filter = st.selectbox("Filter by Overall Rating", RATING_OPTIONS)
+        st.form_submit_button("Apply")
+    
+    # Apply advanced filters in SQL so the keyset pages only hold matching rows
+    filters = {
+        'since': date_filter or None,
+        'username': username_filter if username_filter != 'All' else None,
+        'mess_type': mess_type_filter if mess_type_filter != 'All' else None,
+        'rating': overall_rating_filter if overall_rating_filter != 'All' else None,
+    }
+    filtered_data, has_more = load_pages(
+        'feedback_pages',
+        lambda before_id, limit: get_all_feedback_summary(before_id=before_id, limit=limit, **filters)
     )
     
-    # Export option
+    # Display filtered results
+    st.subheader(f"Feedback Records ({count_feedback(**filters)} entries)")
+    if has_more:
+        st.caption(f"Showing the latest {len(filtered_data)} matching submissions")
+        load_more_button('feedback_pages')
+    
     if not filtered_data.empty:
-        st.download_button(
-            "📥 Export Bathroom Feedback as CSV",
-            filtered_data.to_csv(index=False),
-            "bathroom_feedback.csv",
-            "text/csv"
-        )
+        feedback_records_table(filtered_data)
+        
+        # Export options
+        col1, col2 = st.columns(2)
+        with col1:
+            # Export every matching entry, not just the loaded pages
+            st.download_button(
+                "📥 Export All Feedback as CSV",
+                dataframe_to_csv(get_feedback_export(**filters)),
+                "complete_feedback.csv",
+                "text/csv"
+            )
+        with col2:
+            # Summary report
+            if st.button("📊 Generate Summary Report"):
+                st.success("Summary Report Generated!")
+                
+                # Create summary
+                summary_data = {
+                    'Total Feedback Entries': len(filtered_data),
+                    'Unique Users': filtered_data['username'].nunique(),
+                    'Date Range': f"{filtered_data['timestamp'].min():%Y-%m-%d} to {filtered_data['timestamp'].max():%Y-%m-%d}",
+                    'Most Common Hostel Rating': filtered_data['hostel_rating'].mode().iloc[0] if not filtered_data.empty else 'N/A',
+                    'Most Common Mess Rating': filtered_data['mess_rating'].mode().iloc[0] if not filtered_data.empty else 'N/A',
+                    'Most Common Bathroom Rating': filtered_data['bathroom_rating'].mode().iloc[0] if not filtered_data.empty else 'N/A',
+                    'Most Popular Mess Type': filtered_data['mess_type'].mode().iloc[0] if not filtered_data.empty else 'N/A'
+                }
+                
+                st.json(summary_data)
 
 def feedback_viewer():
     """View all feedback entries (original function with enhancements)"""
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
     st.title("📋 Complete Feedback Records")
     log_admin_action("VIEWED_ALL_FEEDBACK")
     
-    feedback_data = get_all_feedback()
-    if feedback_data.empty:
+    total_feedback = get_dashboard_stats()['feedback']
+    if not total_feedback:
         st.info("No feedback submissions yet")
         return
     
-    # Summary Statistics
+    # Summary Statistics (computed in SQL over all feedback, not just the loaded pages)
+    username_options = get_username_options(get_feedback_epoch())
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Feedback", len(feedback_data))
+        st.metric("Total Feedback", total_feedback)
     with col2:
-        unique_users = feedback_data['username'].nunique()
-        st.metric("Active Users", unique_users)
+        st.metric("Active Users", len(username_options) - 1)
     with col3:
-        avg_hostel_rating = feedback_data['hostel_rating'].mode().iloc[0] if not feedback_data.empty else 'N/A'
-        st.metric("Common Hostel Rating", avg_hostel_rating)
+        st.metric("Common Hostel Rating", get_most_common_rating('hostel'))
     with col4:
-        avg_mess_rating = feedback_data['mess_rating'].mode().iloc[0] if not feedback_data.empty else 'N/A'
-        st.metric("Common Mess Rating", avg_mess_rating)
+        st.metric("Common Mess Rating", get_most_common_rating('mess'))
     
     # Rating Comparison Section
     st.subheader("Rating Comparison Across Categories")
@@ -1510,176 +2041,101 @@ def feedback_viewer():
         else:
             st.info("No bathroom ratings yet")
     
-    # Advanced Filters
-    st.subheader("Advanced Filtering")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        date_filter = st.date_input("Filter by Date (from)")
-    with col2:
-        username_filter = st.selectbox("Filter by User", ['All'] + feedback_data['username'].unique().tolist())
-    with col3:
-        mess_type_filter = st.selectbox("Filter by Mess Type", ['All'] + ['Veg', 'Non-Veg', 'Special', 'Food-Park'])
-    with col4:
-        overall_rating_filter = st.selectbox("Filter by Overall Rating", ['All'] + ['A', 'B', 'C', 'D', 'E'])
-    
-    # Apply advanced filters
-    filtered_data = feedback_data.copy()
-    
-    if date_filter:
-        filtered_data['date'] = pd.to_datetime(filtered_data['timestamp']).dt.date
-        filtered_data = filtered_data[filtered_data['date'] >= date_filter]
-    
-    if username_filter != 'All':
-        filtered_data = filtered_data[filtered_data['username'] == username_filter]
-    
-    if mess_type_filter != 'All':
-        filtered_data = filtered_data[filtered_data['mess_type'] == mess_type_filter]
-    
-    if overall_rating_filter != 'All':
-        filtered_data = filtered_data[
-            (filtered_data['hostel_rating'] == overall_rating_filter) |
-            (filtered_data['mess_rating'] == overall_rating_filter) |
-            (filtered_data['bathroom_rating'] == overall_rating_filter)
-        ]
-    
-    # Display filtered results
-    st.subheader(f"Feedback Records ({len(filtered_data)} entries)")
-    
-    if not filtered_data.empty:
-        st.dataframe(
-            filtered_data,
-            column_config={
-                "timestamp": st.column_config.DatetimeColumn("Date & Time"),
-                "hostel_feedback": st.column_config.TextColumn("Hostel Feedback", width="medium"),
-                "mess_feedback": st.column_config.TextColumn("Mess Feedback", width="medium"),
-                "bathroom_feedback": st.column_config.TextColumn("Bathroom Feedback", width="medium"),
-                "other_comments": st.column_config.TextColumn("Other Comments", width="medium"),
-            },
-            hide_index=True
-        )
-        
-        # Export options
-        col1, col2 = st.columns(2)
-        with col1:
-            st.download_button(
-                "📥 Export All Feedback as CSV",
-                filtered_data.to_csv(index=False),
-                "complete_feedback.csv",
-                "text/csv"
-            )
-        with col2:
-            # Summary report
-            if st.button("📊 Generate Summary Report"):
-                st.success("Summary Report Generated!")
-                
-                # Create summary
-                summary_data = {
-                    'Total Feedback Entries': len(filtered_data),
-                    'Unique Users': filtered_data['username'].nunique(),
-                    'Date Range': f"{filtered_data['timestamp'].min().split('T')[0]} to {filtered_data['timestamp'].max().split('T')[0]}",
-                    'Most Common Hostel Rating': filtered_data['hostel_rating'].mode().iloc[0] if not filtered_data.empty else 'N/A',
-                    'Most Common Mess Rating': filtered_data['mess_rating'].mode().iloc[0] if not filtered_data.empty else 'N/A',
-                    'Most Common Bathroom Rating': filtered_data['bathroom_rating'].mode().iloc[0] if not filtered_data.empty else 'N/A',
-                    'Most Popular Mess Type': filtered_data['mess_type'].mode().iloc[0] if not filtered_data.empty else 'N/A'
-                }
-                
-                st.json(summary_data)
+    feedback_records_section(username_options)
 
 def user_manager():
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
     st.title("👥 User Management")
     log_admin_action("VIEWED_USER_MANAGEMENT")
     
-    users_data = get_all_users()
+    users_data, has_more = load_pages('user_pages', get_all_users)
     if users_data.empty:
         st.info("No users registered yet")
         return
     
     # User statistics
+    stats = get_dashboard_stats()
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Users", len(users_data))
+        st.metric("Total Users", stats['users'])
     with col2:
-        active_users = users_data[users_data['last_login'].notna()]
-        st.metric("Users with Login History", len(active_users))
+        st.metric("Users with Login History", stats['users_with_login'])
     with col3:
-        recent_users = len(users_data[pd.to_datetime(users_data['created_at']).dt.date >= pd.Timestamp.now().date() - pd.Timedelta(days=7)])
-        st.metric("New Users (Last 7 days)", recent_users)
+        st.metric("New Users (Last 7 days)", stats['new_users'])
     
     # Users table
     st.subheader("User Directory")
     st.dataframe(
         users_data,
         column_config={
+            "id": None,
             "last_login": st.column_config.DatetimeColumn("Last Login"),
             "created_at": st.column_config.DatetimeColumn("Registration Date"),
         },
         hide_index=True
     )
+    if has_more:
+        load_more_button('user_pages')
     
     # User management actions
     st.subheader("User Actions")
-    usernames = users_data['username'].tolist()
-    if usernames:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            delete_username = st.selectbox("Select user to remove", usernames)
-            
-            if st.button("🗑️ Delete User", type="primary"):
-                if delete_user(delete_username):
-                    log_admin_action("USER_DELETION", f"Deleted user: {delete_username}")
-                    st.success(f"User {delete_username} removed")
-                    st.rerun()
-                else:
-                    st.error("Failed to delete user")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Look the user up by name so users beyond the loaded pages can be removed too
+        delete_username = st.text_input("Username to remove").strip()
         
-        with col2:
-            st.download_button(
-                "📥 Export User Data",
-                users_data.to_csv(index=False),
-                "users_data.csv",
-                "text/csv"
-            )
+        if st.button("🗑️ Delete User", type="primary") and delete_username:
+            if delete_user(delete_username):
+                log_admin_action("USER_DELETION", f"Deleted user: {delete_username}")
+                st.success(f"User {delete_username} removed")
+                st.rerun()
+            else:
+                st.error(f"No user named {delete_username}")
+    
+    with col2:
+        # Export every user, not just the loaded pages
+        st.download_button(
+            "📥 Export User Data",
+            dataframe_to_csv(get_users_export()),
+            "users_data.csv",
+            "text/csv"
+        )
 
 def system_logs():
-    if not st.session_state.get('is_admin'):
+    if st.session_state.get('role') != 'admin':
         st.warning("Unauthorized access")
         return
     
     st.title("📜 System Logs")
     
-    logs_data = get_admin_logs()
+    logs_data, has_more = load_pages('log_pages', get_admin_logs)
     if logs_data.empty:
         st.info("No system logs yet")
         return
     
-    # Log statistics
+    # Log statistics (from the running per-action totals)
+    action_counts = get_log_action_counts()
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Log Entries", len(logs_data))
+        st.metric("Total Log Entries", int(action_counts.sum()))
     with col2:
-        unique_actions = logs_data['action'].nunique()
-        st.metric("Unique Actions", unique_actions)
+        st.metric("Unique Actions", len(action_counts))
     with col3:
-        latest_log = logs_data['timestamp'].max() if not logs_data.empty else 'N/A'
-        st.metric("Latest Activity", latest_log.split('T')[0] if latest_log != 'N/A' else 'N/A')
+        st.metric("Latest Activity", get_latest_log_date())
     
     # Action frequency
     st.subheader("Admin Actions Frequency")
-    if not logs_data.empty:
-        action_counts = logs_data['action'].value_counts()
-        if not action_counts.empty:
-            col1, col2 = st.columns(2)
-            with col1:
-                for action, count in action_counts.items():
-                    st.metric(action, count)
-            with col2:
-                st.bar_chart(action_counts)
+    if not action_counts.empty:
+        col1, col2 = st.columns(2)
+        with col1:
+            for action, count in action_counts.items():
+                st.metric(action, count)
+        with col2:
+            st.bar_chart(action_counts)
     
     # Logs table
     st.subheader("Detailed Logs")
@@ -1692,6 +2148,8 @@ def system_logs():
         },
         hide_index=True
     )
+    if has_more:
+        load_more_button('log_pages')
     
     # Log management
     col1, col2 = st.columns(2)
@@ -1705,13 +2163,44 @@ def system_logs():
                 st.error("Failed to clear logs")
     
     with col2:
+        # Export every log entry, not just the loaded pages
         st.download_button(
             "📥 Export Logs as CSV",
-            logs_data.to_csv(index=False),
+            dataframe_to_csv(get_admin_logs_export()),
             "system_logs.csv",
             "text/csv"
         )
 
+# ======================
+# PAGE REGISTRY
+# ======================
+# (page function, navigation title) pairs offered to each role
+ADMIN_PAGES = (
+    (admin_dashboard, "Dashboard"),
+    (hostel_management, "Hostel Management"),
+    (room_management, "Room Management"),
+    (guest_management, "Guest Management"),
+    (hostel_feedback_viewer, "Hostel Feedback"),
+    (mess_feedback_viewer, "Mess Feedback"),
+    (bathroom_feedback_viewer, "Bathroom Feedback"),
+    (feedback_viewer, "All Feedback"),
+    (user_manager, "User Management"),
+    (system_logs, "System Logs"),
+)
+USER_PAGES = (
+    (home_page, "Home"),
+    (feedback_page, "Submit Feedback"),
+    (faq_page, "FAQ"),
+)
+GUEST_PAGES = (
+    (home_page, "Home"),
+    (register_page, "Register"),
+    (render_login_page, "Login"),
+    (faq_page, "FAQ"),
+)
+PAGES_BY_ROLE = {'admin': ADMIN_PAGES, 'user': USER_PAGES, 'guest': GUEST_PAGES}
+SIDEBARS_BY_ROLE = {'admin': show_admin_sidebar, 'user': show_user_sidebar, 'guest': show_guest_sidebar}
+
 # ======================
 # APPLICATION ENTRY
 # ======================